@@ -1,3 +1,4 @@
+from functools import cached_property
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -15,6 +16,14 @@ class Settings(BaseSettings):
     MONGODB_COLLECTION_NOTES: str
     MONGODB_COLLECTION_MEMORIES: str
 
+    # Derived values used on every authenticated request; computed once
+    @cached_property
+    def supabase_issuer(self) -> str:
+        return f"{self.SUPABASE_URL}/auth/v1"
+
+    @cached_property
+    def supabase_jwt_secret_stripped(self) -> str:
+        return self.SUPABASE_JWT_SECRET.strip()
 
     class Config:
         env_file = ".env"
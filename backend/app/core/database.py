@@ -1,6 +1,10 @@
 from app.core.config import settings
 from pymongo.mongo_client import MongoClient
 from pymongo.server_api import ServerApi
+from pymongo.errors import ConnectionFailure
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 uri = settings.MONGODB_URI
@@ -16,4 +20,42 @@ collection_memories = db[settings.MONGODB_COLLECTION_MEMORIES]
 collection_notes = db[settings.MONGODB_COLLECTION_NOTES]
 
 
-
+def ensure_indexes():
+    """
+    Create the indexes the services query on. Idempotent, safe on every startup.
+    An index error does not skip the rest, but an unreachable server stops
+    the run; returns the number of indexes that could not be created.
+    """
+    indexes = [
+        # Bookmarks and notes are listed per user and deleted by doc_id;
+        # without these indexes each of those calls is a full collection scan
+        (collection_memories, "user_id", {}),
+        (collection_memories, "doc_id", {}),
+        (collection_notes, "user_id", {}),
+        (collection_notes, "doc_id", {}),
+        # Every user lookup/upsert filters on {"id": user_id}; unique also
+        # stops concurrent first requests from creating duplicate user
+        # documents. Last, since existing duplicates make it fail.
+        (collection, "id", {"unique": True}),
+    ]
+
+    failed = 0
+    for position, (target, field, options) in enumerate(indexes):
+        name = f"{field}_1"
+        try:
+            target.create_index([(field, 1)], name=name, **options)
+        except ConnectionFailure as e:
+            # Server unreachable (ServerSelectionTimeoutError included): every
+            # remaining index would wait out the same timeout, so stop here
+            remaining = len(indexes) - position
+            logger.error("❌ DATABASE: MongoDB unreachable, skipping %d index(es)", remaining)
+            logger.error("   ├─ Error type: %s", type(e).__name__)
+            logger.error("   └─ Error message: %s", e)
+            return failed + remaining
+        except Exception as e:
+            # Index-specific problems (conflicting options, duplicate keys)
+            failed += 1
+            logger.error("❌ DATABASE: Failed to create index %s on %s", name, target.name)
+            logger.error("   ├─ Error type: %s", type(e).__name__)
+            logger.error("   └─ Error message: %s", e)
+    return failed
@@ -5,7 +5,7 @@ from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from pymongo.errors import PyMongoError, ConnectionFailure, ServerSelectionTimeoutError
 from pinecone.exceptions import PineconeException
-from jose import JWTError
+from jwt import InvalidTokenError
 from pydantic import ValidationError
 import traceback
 from typing import Union
@@ -130,7 +130,7 @@ async def global_exception_handler(request: Request, exc: Exception) -> JSONResp
             }
         )
     
-    elif isinstance(exc, JWTError):
+    elif isinstance(exc, InvalidTokenError):
         return JSONResponse(
             status_code=401,
             content={
@@ -1,9 +1,16 @@
-from jose import jwt, JWTError
+from jwt import InvalidTokenError
 from fastapi import FastAPI, Request, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse
 from dotenv import load_dotenv
 from app.routers.bookmarkRouters import router as bookmark_router
-from app.utils.jwt import decodeJWT, refresh_access_token, TokenExpiredError
+from app.utils.jwt import (
+    decodeJWT,
+    refresh_access_token,
+    TokenExpiredError,
+    create_http_client,
+    set_http_client
+)
 from app.services.user_service import create_user_if_not_exists
 from fastapi.middleware.cors import CORSMiddleware
 from app.routers.get_quotes import router as get_quotes_router
@@ -12,9 +19,9 @@ from app.routers.summaryRouter import router as summary_router
 from app.routers.auth_router import router as auth_router
 from app.exceptions.global_exceptions import (
     global_exception_handler,
-    AuthenticationError,
     create_error_response
 )
+from app.core.database import ensure_indexes
 from app.core.database_wrapper import get_database_health
 from app.core.pinecone_wrapper import get_pinecone_health
 from slowapi import _rate_limit_exceeded_handler
@@ -23,11 +30,13 @@ from slowapi.middleware import SlowAPIMiddleware
 
 load_dotenv()
 
+import asyncio
 import logging
+import orjson
+import re
 import time
+from contextlib import asynccontextmanager
 from datetime import datetime
-import asyncio
-from collections import defaultdict
 
 # Configure logging
 logging.basicConfig(
@@ -36,16 +45,27 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Global refresh token locks to prevent race conditions
-refresh_locks = defaultdict(asyncio.Lock)
-active_refreshes = {}  # Store active refresh promises
+# Endpoints that bypass authentication, built once instead of per request
+PUBLIC_PATHS = frozenset({"/health", "/health/detailed"})
+PUBLIC_PATH_PREFIXES = ("/auth/", "/quotes")
+
+# Refresh failures that mean the session is gone and the user must log in
+# again. Compiled once; matched case-insensitively against the error detail
+# (or, for JSON details, the Supabase error_code and msg)
+_SESSION_EXPIRED_RE = re.compile(
+    r"already[_ ]used|invalid refresh token|expired|revoked", re.IGNORECASE
+)
+_SESSION_EXPIRED_CODES = frozenset({"refresh_token_already_used"})
+_SESSION_EXPIRED_MSG_RE = re.compile(
+    r"already used|invalid refresh token|expired", re.IGNORECASE
+)
 
 # Helper functions for authentication middleware
 def validate_user_id(payload, context="token"):
     """Validate that user ID exists in token payload"""
     user_id = payload.get("sub")
     if not user_id:
-        logger.warning(f"{context} payload missing user ID")
+        logger.warning("%s payload missing user ID", context)
         return None, create_error_response(
             f"Invalid {context} payload",
             status_code=401,
@@ -63,13 +83,13 @@ def create_auth_error_response(message, status_code=401):
 
 def set_secure_cookie(response, key, value, expires_seconds):
     """Set a secure cookie with standard security options"""
-    logger.info(f"🍪 COOKIE: Setting secure cookie: {key}")
-    logger.info(f"   ├─ Cookie name: {key}")
-    logger.info(f"   ├─ Value length: {len(value) if value else 0}")
-    logger.info(f"   ├─ Expires in: {expires_seconds} seconds")
-    logger.info(f"   ├─ HttpOnly: True")
-    logger.info(f"   ├─ Secure: True")
-    logger.info(f"   └─ SameSite: none")
+    logger.debug("🍪 COOKIE: Setting secure cookie: %s", key)
+    logger.debug("   ├─ Cookie name: %s", key)
+    logger.debug("   ├─ Value length: %s", len(value) if value else 0)
+    logger.debug("   ├─ Expires in: %s seconds", expires_seconds)
+    logger.debug("   ├─ HttpOnly: True")
+    logger.debug("   ├─ Secure: True")
+    logger.debug("   └─ SameSite: none")
     
     try:
         response.set_cookie(
@@ -80,19 +100,19 @@ def set_secure_cookie(response, key, value, expires_seconds):
             secure=True,
             samesite="none"
         )
-        logger.info(f"✅ COOKIE: Successfully set {key} cookie")
+        logger.debug("✅ COOKIE: Successfully set %s cookie", key)
     except Exception as e:
-        logger.error(f"❌ COOKIE: Error setting {key} cookie: {str(e)}")
-        logger.error(f"   ├─ Error type: {type(e).__name__}")
-        logger.error(f"   └─ This may affect authentication")
+        logger.error("❌ COOKIE: Error setting %s cookie: %s", key, e)
+        logger.error("   ├─ Error type: %s", type(e).__name__)
+        logger.error("   └─ This may affect authentication")
 
 def set_user_cookie(response, key, value, expires_seconds=3600):
     """Set a user-related cookie (less strict security for user info)"""
-    logger.info(f"👤 USER COOKIE: Setting user cookie: {key}")
-    logger.info(f"   ├─ Cookie name: {key}")
-    logger.info(f"   ├─ Value: {value}")
-    logger.info(f"   ├─ Expires in: {expires_seconds} seconds")
-    logger.info(f"   └─ HttpOnly: True")
+    logger.debug("👤 USER COOKIE: Setting user cookie: %s", key)
+    logger.debug("   ├─ Cookie name: %s", key)
+    logger.debug("   ├─ Value: %s", value)
+    logger.debug("   ├─ Expires in: %s seconds", expires_seconds)
+    logger.debug("   └─ HttpOnly: True")
     
     try:
         response.set_cookie(
@@ -101,13 +121,13 @@ def set_user_cookie(response, key, value, expires_seconds=3600):
             expires=int(time.time() + expires_seconds),
             httponly=True
         )
-        logger.info(f"✅ USER COOKIE: Successfully set {key} cookie")
+        logger.debug("✅ USER COOKIE: Successfully set %s cookie", key)
     except Exception as e:
-        logger.error(f"❌ USER COOKIE: Error setting {key} cookie: {str(e)}")
-        logger.error(f"   └─ Error type: {type(e).__name__}")
+        logger.error("❌ USER COOKIE: Error setting %s cookie: %s", key, e)
+        logger.error("   └─ Error type: %s", type(e).__name__)
 
 def handle_token_refresh(refresh_token):
-    """Handle token refresh logic with concurrency control and return new tokens"""
+    """Handle token refresh logic and return new tokens"""
     async def _refresh():
         if not refresh_token:
             logger.warning("No refresh token available for token refresh")
@@ -115,30 +135,9 @@ def handle_token_refresh(refresh_token):
                 "Access token expired and no refresh token available"
             )
         
-        # Use a lock per refresh token to prevent concurrent refreshes
-        lock = refresh_locks[refresh_token]
-        
-        async with lock:
-            # Check if there's already an active refresh for this token
-            if refresh_token in active_refreshes:
-                logger.info("Refresh already in progress, waiting for result...")
-                try:
-                    return await active_refreshes[refresh_token]
-                except Exception as e:
-                    logger.error(f"Waiting for active refresh failed: {str(e)}")
-                    # Continue with new refresh attempt
-            
-            # Create refresh promise
-            refresh_promise = asyncio.create_task(_do_refresh(refresh_token))
-            active_refreshes[refresh_token] = refresh_promise
-            
-            try:
-                result = await refresh_promise
-                return result
-            finally:
-                # Clean up
-                active_refreshes.pop(refresh_token, None)
-                refresh_locks.pop(refresh_token, None)
+        # Concurrent refreshes of the same token are coalesced inside
+        # refresh_access_token, which shares one Supabase call's result
+        return await _do_refresh(refresh_token)
     
     async def _do_refresh(refresh_token):
         try:
@@ -162,7 +161,7 @@ def handle_token_refresh(refresh_token):
             
         except HTTPException as refresh_error:
             error_detail = refresh_error.detail
-            logger.error(f"Token refresh failed: {error_detail}")
+            logger.error("Token refresh failed: %s", error_detail)
             
             # Enhanced detection for refresh token issues
             is_token_invalid = False
@@ -170,32 +169,21 @@ def handle_token_refresh(refresh_token):
             # Check for various token invalid scenarios
             if isinstance(error_detail, str):
                 # Direct string check
-                error_lower = error_detail.lower()
-                is_token_invalid = (
-                    "already_used" in error_lower or 
-                    "already used" in error_lower or
-                    "refresh_token_already_used" in error_lower or
-                    "invalid refresh token" in error_lower or
-                    "expired" in error_lower or
-                    "revoked" in error_lower
-                )
+                is_token_invalid = _SESSION_EXPIRED_RE.search(error_detail) is not None
                 
                 # Also try to parse as JSON if it looks like JSON
-                if error_detail.strip().startswith('{'):
+                if error_detail.lstrip().startswith('{'):
                     try:
-                        import json
-                        error_json = json.loads(error_detail)
+                        error_json = orjson.loads(error_detail)
                         error_code = error_json.get("error_code", "")
-                        error_msg = error_json.get("msg", "").lower()
+                        error_msg = error_json.get("msg", "")
                         
                         is_token_invalid = (
-                            error_code == "refresh_token_already_used" or
-                            "already used" in error_msg or
-                            "invalid refresh token" in error_msg or
-                            "expired" in error_msg
+                            error_code in _SESSION_EXPIRED_CODES or
+                            _SESSION_EXPIRED_MSG_RE.search(error_msg) is not None
                         )
-                        logger.info(f"   ├─ Parsed JSON error: code={error_code}, msg={error_msg}")
-                    except json.JSONDecodeError:
+                        logger.info("   ├─ Parsed JSON error: code=%s, msg=%s", error_code, error_msg)
+                    except orjson.JSONDecodeError:
                         pass  # Not JSON, use string check above
             
             if is_token_invalid:
@@ -212,7 +200,7 @@ def handle_token_refresh(refresh_token):
                 error_type="auth_error"
             )
         except Exception as refresh_error:
-            logger.error(f"Unexpected token refresh error: {str(refresh_error)}")
+            logger.error("Unexpected token refresh error: %s", refresh_error)
             return None, None, create_error_response(
                 "Authentication service error",
                 status_code=503,
@@ -223,45 +211,45 @@ def handle_token_refresh(refresh_token):
 
 def update_token_cookies(response, new_access_token, new_refresh_token, original_refresh_token):
     """Update access and refresh token cookies if tokens were refreshed"""
-    logger.info(f"🔄 TOKEN COOKIES: Updating authentication cookies after refresh")
-    logger.info(f"   ├─ New access token present: {bool(new_access_token)}")
-    logger.info(f"   ├─ New refresh token present: {bool(new_refresh_token)}")
-    logger.info(f"   └─ Refresh token changed: {new_refresh_token != original_refresh_token if new_refresh_token and original_refresh_token else 'Unknown'}")
+    logger.debug("🔄 TOKEN COOKIES: Updating authentication cookies after refresh")
+    logger.debug("   ├─ New access token present: %s", bool(new_access_token))
+    logger.debug("   ├─ New refresh token present: %s", bool(new_refresh_token))
+    logger.debug("   └─ Refresh token changed: %s", new_refresh_token != original_refresh_token if new_refresh_token and original_refresh_token else 'Unknown')
     
     try:
         # Set new access token
         if new_access_token:
-            logger.info(f"   ├─ Setting new access token cookie")
+            logger.debug("   ├─ Setting new access token cookie")
             set_secure_cookie(response, "access_token", new_access_token, 3600)  # 1 hour
         
         # Set new refresh token if different
         if new_refresh_token and new_refresh_token != original_refresh_token:
-            logger.info(f"   ├─ Setting new refresh token cookie (token changed)")
+            logger.debug("   ├─ Setting new refresh token cookie (token changed)")
             set_secure_cookie(response, "refresh_token", new_refresh_token, 604800)  # 7 days
         elif new_refresh_token:
-            logger.info(f"   ├─ Refresh token unchanged, keeping existing cookie")
+            logger.debug("   ├─ Refresh token unchanged, keeping existing cookie")
             
-        logger.info(f"✅ TOKEN COOKIES: Token cookies updated successfully")
+        logger.debug("✅ TOKEN COOKIES: Token cookies updated successfully")
     except Exception as e:
-        logger.error(f"❌ TOKEN COOKIES: Error setting refreshed token cookies: {str(e)}")
-        logger.error(f"   └─ This may cause authentication issues")
+        logger.error("❌ TOKEN COOKIES: Error setting refreshed token cookies: %s", e)
+        logger.error("   └─ This may cause authentication issues")
 
 def update_user_cookies(response, request, user_id, payload):
     """Update user-related cookies if not already set or different"""
-    logger.info(f"👤 USER COOKIES: Updating user information cookies")
-    logger.info(f"   ├─ User ID: {user_id}")
+    logger.debug("👤 USER COOKIES: Updating user information cookies")
+    logger.debug("   ├─ User ID: %s", user_id)
     
     try:
         # Set user_id cookie if not already set or different
         current_user_id = request.cookies.get("user_id")
-        logger.info(f"   ├─ Current user_id cookie: {current_user_id}")
-        logger.info(f"   ├─ New user_id: {user_id}")
+        logger.debug("   ├─ Current user_id cookie: %s", current_user_id)
+        logger.debug("   ├─ New user_id: %s", user_id)
         
         if current_user_id != user_id:
-            logger.info(f"   ├─ User ID changed, updating cookie")
+            logger.debug("   ├─ User ID changed, updating cookie")
             set_user_cookie(response, "user_id", user_id)
         else:
-            logger.info(f"   ├─ User ID unchanged")
+            logger.debug("   ├─ User ID unchanged")
 
         # Set user metadata cookies if not already set or different
         user_metadata = payload.get("user_metadata", {})
@@ -271,31 +259,31 @@ def update_user_cookies(response, request, user_id, payload):
         current_user_name = request.cookies.get("user_name")
         current_user_picture = request.cookies.get("user_picture")
         
-        logger.info(f"   ├─ Full name from token: {full_name}")
-        logger.info(f"   ├─ Current user_name cookie: {current_user_name}")
-        logger.info(f"   ├─ Picture from token: {bool(picture)}")
-        logger.info(f"   └─ Current user_picture cookie: {bool(current_user_picture)}")
+        logger.debug("   ├─ Full name from token: %s", full_name)
+        logger.debug("   ├─ Current user_name cookie: %s", current_user_name)
+        logger.debug("   ├─ Picture from token: %s", bool(picture))
+        logger.debug("   └─ Current user_picture cookie: %s", bool(current_user_picture))
 
         if full_name and current_user_name != full_name:
-            logger.info(f"   ├─ User name changed, updating cookie")
+            logger.debug("   ├─ User name changed, updating cookie")
             set_user_cookie(response, "user_name", full_name)
         else:
-            logger.info(f"   ├─ User name unchanged")
+            logger.debug("   ├─ User name unchanged")
             
         if picture and current_user_picture != picture:
-            logger.info(f"   ├─ User picture changed, updating cookie")
+            logger.debug("   ├─ User picture changed, updating cookie")
             set_user_cookie(response, "user_picture", picture)
         else:
-            logger.info(f"   ├─ User picture unchanged")
+            logger.debug("   ├─ User picture unchanged")
             
-        logger.info(f"✅ USER COOKIES: User cookies updated successfully")
+        logger.debug("✅ USER COOKIES: User cookies updated successfully")
     except Exception as e:
-        logger.error(f"❌ USER COOKIES: Error setting user cookies: {str(e)}")
-        logger.error(f"   └─ This may affect user experience but not authentication")
+        logger.error("❌ USER COOKIES: Error setting user cookies: %s", e)
+        logger.error("   └─ This may affect user experience but not authentication")
 
 def clear_all_auth_cookies(response):
     """Clear all authentication cookies with proper domain settings"""
-    logger.info(f"🧹 COOKIE CLEANUP: Clearing all authentication cookies")
+    logger.info("🧹 COOKIE CLEANUP: Clearing all authentication cookies")
     
     auth_cookie_names = [
         "access_token",
@@ -314,15 +302,47 @@ def clear_all_auth_cookies(response):
                 samesite="none",
                 secure=True
             )
-            logger.info(f"   ├─ Cleared cookie: {cookie_name}")
+            logger.info("   ├─ Cleared cookie: %s", cookie_name)
         except Exception as e:
-            logger.error(f"   ❌ Failed to clear cookie {cookie_name}: {str(e)}")
+            logger.error("   ❌ Failed to clear cookie %s: %s", cookie_name, e)
     
-    logger.info(f"✅ COOKIE CLEANUP: All authentication cookies cleared")
+    logger.info("✅ COOKIE CLEANUP: All authentication cookies cleared")
 
 # Import the limiter from the dedicated module to avoid circular imports
 from app.core.rate_limiter import limiter
 
+async def create_database_indexes():
+    """Ensure MongoDB indexes exist (runs in the background after startup)"""
+    try:
+        # pymongo blocks; run it in a worker thread so an unreachable server
+        # does not stall the event loop for the server-selection timeout
+        failed = await run_in_threadpool(ensure_indexes)
+        if failed:
+            logger.warning("⚠️ STARTUP: %d MongoDB index(es) could not be created", failed)
+        else:
+            logger.info("✅ STARTUP: MongoDB indexes ensured")
+    except Exception as e:
+        # Queries still work without the indexes, just slower
+        logger.error("❌ STARTUP: Failed to ensure MongoDB indexes: %s", e)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Startup/shutdown: MongoDB indexes and the pooled Supabase HTTP client"""
+    # Build indexes in the background so requests are served straight away;
+    # the reference keeps the task from being garbage collected mid-run
+    app.state.index_task = asyncio.create_task(create_database_indexes())
+
+    # Shared by Supabase token refreshes
+    app.state.http_client = create_http_client()
+    set_http_client(app.state.http_client)
+    try:
+        yield
+    finally:
+        app.state.index_task.cancel()
+        # Close pooled connections held by the shared HTTP client
+        set_http_client(None)
+        await app.state.http_client.aclose()
+
 # Create FastAPI app with enhanced error handling and disabled documentation
 app = FastAPI(
     title="HippoCampus API",
@@ -330,7 +350,8 @@ app = FastAPI(
     version="1.0.0",
     docs_url=None,     # Disable Swagger UI
     redoc_url=None,    # Disable ReDoc
-    openapi_url=None   # Disable OpenAPI JSON endpoint
+    openapi_url=None,  # Disable OpenAPI JSON endpoint
+    lifespan=lifespan
 )
 
 # Add rate limiter to app state and configure middleware
@@ -343,34 +364,40 @@ async def authorisation_middleware(request: Request, call_next):
     """
     Enhanced authentication middleware with improved token refresh capability
     """
+    # Runs on every request: use lazy %-style logging so messages are only
+    # formatted when INFO is enabled, and gate the multi-line trees.
+    log_info = logger.isEnabledFor(logging.INFO)
+
     # Log initial request details
-    logger.info(f"🔍 AUTH MIDDLEWARE: Incoming {request.method} request to {request.url.path}")
-    logger.info(f"   ├─ User-Agent: {request.headers.get('user-agent', 'Unknown')[:50]}...")
-    logger.info(f"   ├─ Remote IP: {request.client.host if request.client else 'Unknown'}")
-    logger.info(f"   └─ Content-Type: {request.headers.get('content-type', 'None')}")
+    if log_info:
+        logger.info("🔍 AUTH MIDDLEWARE: Incoming %s request to %s", request.method, request.url.path)
+        logger.info("   ├─ User-Agent: %s...", request.headers.get('user-agent', 'Unknown')[:50])
+        logger.info("   ├─ Remote IP: %s", request.client.host if request.client else 'Unknown')
+        logger.info("   └─ Content-Type: %s", request.headers.get('content-type', 'None'))
     
     # Skip auth for health check, auth endpoints, and quotes
-    if (request.url.path in ["/health", "/health/detailed"] or 
-        request.url.path.startswith("/auth/") or request.url.path.startswith("/quotes")):
-        logger.info(f"✅ AUTH MIDDLEWARE: Skipping auth for public endpoint: {request.url.path}")
+    path = request.url.path
+    if path in PUBLIC_PATHS or path.startswith(PUBLIC_PATH_PREFIXES):
+        logger.info("✅ AUTH MIDDLEWARE: Skipping auth for public endpoint: %s", path)
         return await call_next(request)
     
-    logger.info(f"🔐 AUTH MIDDLEWARE: Protected endpoint - authentication required")
+    logger.info("🔐 AUTH MIDDLEWARE: Protected endpoint - authentication required")
     
     try:
         # Extract tokens from cookies or headers
-        logger.info(f"🍪 AUTH MIDDLEWARE: Extracting tokens from request")
+        logger.info("🍪 AUTH MIDDLEWARE: Extracting tokens from request")
         access_token = request.cookies.get("access_token") or request.headers.get("access_token")
         refresh_token = request.cookies.get("refresh_token") or request.headers.get("refresh_token")
         
         # Log token presence (without exposing actual tokens)
-        logger.info(f"   ├─ Access token present: {bool(access_token)} (length: {len(access_token) if access_token else 0})")
-        logger.info(f"   └─ Refresh token present: {bool(refresh_token)} (length: {len(refresh_token) if refresh_token else 0})")
+        if log_info:
+            logger.info("   ├─ Access token present: %s (length: %d)", bool(access_token), len(access_token) if access_token else 0)
+            logger.info("   └─ Refresh token present: %s (length: %d)", bool(refresh_token), len(refresh_token) if refresh_token else 0)
 
         if not access_token:
-            logger.warning(f"❌ AUTH MIDDLEWARE: Missing access token for {request.method} {request.url}")
-            logger.warning(f"   ├─ Available cookies: {list(request.cookies.keys())}")
-            logger.warning(f"   └─ Available headers: {list(request.headers.keys())}")
+            logger.warning("❌ AUTH MIDDLEWARE: Missing access token for %s %s", request.method, request.url)
+            logger.warning("   ├─ Available cookies: %s", list(request.cookies.keys()))
+            logger.warning("   └─ Available headers: %s", list(request.headers.keys()))
             return create_auth_error_response("Access token is missing")
 
         payload = None
@@ -379,69 +406,71 @@ async def authorisation_middleware(request: Request, call_next):
         token_refreshed = False
 
         # Try to validate the current access token
-        logger.info(f"🔍 AUTH MIDDLEWARE: Attempting to validate access token")
+        logger.info("🔍 AUTH MIDDLEWARE: Attempting to validate access token")
         try:
-            logger.info(f"   ├─ Decoding JWT token...")
+            logger.info("   ├─ Decoding JWT token...")
             payload = await decodeJWT(access_token)
-            logger.info(f"   ├─ JWT decode successful")
-            logger.info(f"   ├─ Token subject (user_id): {payload.get('sub', 'Missing')}")
-            logger.info(f"   ├─ Token issuer: {payload.get('iss', 'Missing')}")
-            logger.info(f"   ├─ Token audience: {payload.get('aud', 'Missing')}")
-            logger.info(f"   ├─ Token expiry: {payload.get('exp', 'Missing')}")
-            logger.info(f"   └─ Token issued at: {payload.get('iat', 'Missing')}")
+            if log_info:
+                logger.info("   ├─ JWT decode successful")
+                logger.info("   ├─ Token subject (user_id): %s", payload.get('sub', 'Missing'))
+                logger.info("   ├─ Token issuer: %s", payload.get('iss', 'Missing'))
+                logger.info("   ├─ Token audience: %s", payload.get('aud', 'Missing'))
+                logger.info("   ├─ Token expiry: %s", payload.get('exp', 'Missing'))
+                logger.info("   └─ Token issued at: %s", payload.get('iat', 'Missing'))
             
             user_id, error_response = validate_user_id(payload)
             if error_response:
-                logger.error(f"❌ AUTH MIDDLEWARE: User ID validation failed")
+                logger.error("❌ AUTH MIDDLEWARE: User ID validation failed")
                 return error_response
             
-            logger.info(f"✅ AUTH MIDDLEWARE: Access token validation successful for user: {user_id}")
+            logger.info("✅ AUTH MIDDLEWARE: Access token validation successful for user: %s", user_id)
 
         except TokenExpiredError:
-            logger.warning(f"⏰ AUTH MIDDLEWARE: Access token expired, attempting refresh...")
-            logger.info(f"   ├─ Starting token refresh process")
-            logger.info(f"   ├─ Refresh token available: {bool(refresh_token)}")
+            logger.warning("⏰ AUTH MIDDLEWARE: Access token expired, attempting refresh...")
+            logger.info("   ├─ Starting token refresh process")
+            logger.info("   ├─ Refresh token available: %s", bool(refresh_token))
             
             # Handle token refresh
-            logger.info(f"🔄 AUTH MIDDLEWARE: Initiating token refresh")
+            logger.info("🔄 AUTH MIDDLEWARE: Initiating token refresh")
             new_access_token, new_refresh_token, error_response = await handle_token_refresh(refresh_token)
             if error_response:
-                logger.error(f"❌ AUTH MIDDLEWARE: Token refresh failed")
-                logger.error(f"   ├─ Error status: {error_response.status_code}")
-                logger.error(f"   └─ Error detail: {getattr(error_response, 'body', 'Unknown error')}")
+                logger.error("❌ AUTH MIDDLEWARE: Token refresh failed")
+                logger.error("   ├─ Error status: %s", error_response.status_code)
+                logger.error("   └─ Error detail: %s", getattr(error_response, 'body', 'Unknown error'))
                 
                 # Check if this is a session expired error requiring re-authentication
                 if error_response.status_code == 401 and "session_expired" in str(error_response.body):
-                    logger.warning(f"🚫 AUTH MIDDLEWARE: Session expired - clearing all auth cookies")
+                    logger.warning("🚫 AUTH MIDDLEWARE: Session expired - clearing all auth cookies")
                     # Clear all authentication cookies to force fresh login
                     clear_all_auth_cookies(error_response)
                 return error_response
             
-            logger.info(f"✅ AUTH MIDDLEWARE: Token refresh successful")
-            logger.info(f"   ├─ New access token received: {bool(new_access_token)}")
-            logger.info(f"   └─ New refresh token received: {bool(new_refresh_token)}")
+            if log_info:
+                logger.info("✅ AUTH MIDDLEWARE: Token refresh successful")
+                logger.info("   ├─ New access token received: %s", bool(new_access_token))
+                logger.info("   └─ New refresh token received: %s", bool(new_refresh_token))
             
             # Decode the new access token to get user info
-            logger.info(f"🔍 AUTH MIDDLEWARE: Validating refreshed access token")
+            logger.info("🔍 AUTH MIDDLEWARE: Validating refreshed access token")
             payload = await decodeJWT(new_access_token)
             user_id, error_response = validate_user_id(payload, "refreshed token")
             if error_response:
-                logger.error(f"❌ AUTH MIDDLEWARE: Refreshed token validation failed")
+                logger.error("❌ AUTH MIDDLEWARE: Refreshed token validation failed")
                 return error_response
             
-            logger.info(f"✅ AUTH MIDDLEWARE: Refreshed token validation successful for user: {user_id}")
+            logger.info("✅ AUTH MIDDLEWARE: Refreshed token validation successful for user: %s", user_id)
             token_refreshed = True
             
-        except JWTError as e:
-            logger.warning(f"❌ AUTH MIDDLEWARE: JWT validation failed: {str(e)}")
-            logger.warning(f"   ├─ Error type: {type(e).__name__}")
-            logger.warning(f"   └─ Token format issues detected")
+        except InvalidTokenError as e:
+            logger.warning("❌ AUTH MIDDLEWARE: JWT validation failed: %s", e)
+            logger.warning("   ├─ Error type: %s", type(e).__name__)
+            logger.warning("   └─ Token format issues detected")
             return create_auth_error_response(f"Invalid token: {str(e)}")
             
         except HTTPException as e:
-            logger.warning(f"❌ AUTH MIDDLEWARE: HTTP exception during token validation: {e.detail}")
-            logger.warning(f"   ├─ Status code: {e.status_code}")
-            logger.warning(f"   └─ Error detail: {e.detail}")
+            logger.warning("❌ AUTH MIDDLEWARE: HTTP exception during token validation: %s", e.detail)
+            logger.warning("   ├─ Status code: %s", e.status_code)
+            logger.warning("   └─ Error detail: %s", e.detail)
             return create_error_response(
                 e.detail,
                 status_code=e.status_code,
@@ -449,46 +478,48 @@ async def authorisation_middleware(request: Request, call_next):
             )
 
         # Create user if not exists (with error handling)
-        logger.info(f"👤 AUTH MIDDLEWARE: Ensuring user exists in database")
+        logger.info("👤 AUTH MIDDLEWARE: Ensuring user exists in database")
         try:
             await create_user_if_not_exists(payload)
-            logger.info(f"✅ AUTH MIDDLEWARE: User validation/creation successful")
+            logger.info("✅ AUTH MIDDLEWARE: User validation/creation successful")
         except Exception as e:
-            logger.error(f"❌ AUTH MIDDLEWARE: Error creating/validating user: {str(e)}")
-            logger.error(f"   └─ Continuing request despite user creation error")
+            logger.error("❌ AUTH MIDDLEWARE: Error creating/validating user: %s", e)
+            logger.error("   └─ Continuing request despite user creation error")
             # Don't fail the request if user creation fails
 
         # Store user info in request state
-        logger.info(f"📝 AUTH MIDDLEWARE: Storing user context in request state")
         request.state.user_id = user_id
         request.state.user_payload = payload
-        logger.info(f"   ├─ User ID: {user_id}")
-        logger.info(f"   └─ Payload keys: {list(payload.keys())}")
+        if log_info:
+            logger.info("📝 AUTH MIDDLEWARE: Storing user context in request state")
+            logger.info("   ├─ User ID: %s", user_id)
+            logger.info("   └─ Payload keys: %s", list(payload.keys()))
         
         # Continue the request
-        logger.info(f"➡️  AUTH MIDDLEWARE: Proceeding to route handler")
+        logger.info("➡️  AUTH MIDDLEWARE: Proceeding to route handler")
         response = await call_next(request)
-        logger.info(f"⬅️  AUTH MIDDLEWARE: Route handler completed, processing response")
-        logger.info(f"   ├─ Response status: {response.status_code}")
-        logger.info(f"   └─ Response headers: {list(response.headers.keys())}")
+        if log_info:
+            logger.info("⬅️  AUTH MIDDLEWARE: Route handler completed, processing response")
+            logger.info("   ├─ Response status: %s", response.status_code)
+            logger.info("   └─ Response headers: %s", list(response.headers.keys()))
 
         # Update cookies if tokens were refreshed
         if token_refreshed:
-            logger.info(f"🍪 AUTH MIDDLEWARE: Updating authentication cookies with refreshed tokens")
+            logger.info("🍪 AUTH MIDDLEWARE: Updating authentication cookies with refreshed tokens")
             update_token_cookies(response, new_access_token, new_refresh_token, refresh_token)
 
         # Set user-related cookies if not already set
-        logger.info(f"🍪 AUTH MIDDLEWARE: Updating user information cookies")
+        logger.info("🍪 AUTH MIDDLEWARE: Updating user information cookies")
         update_user_cookies(response, request, user_id, payload)
 
-        logger.info(f"✅ AUTH MIDDLEWARE: Request processing completed successfully")
+        logger.info("✅ AUTH MIDDLEWARE: Request processing completed successfully")
         return response
 
     except Exception as e:
-        logger.error(f"💥 AUTH MIDDLEWARE: Unexpected error in auth middleware: {str(e)}", exc_info=True)
-        logger.error(f"   ├─ Error type: {type(e).__name__}")
-        logger.error(f"   ├─ Request path: {request.url.path}")
-        logger.error(f"   └─ Request method: {request.method}")
+        logger.error("💥 AUTH MIDDLEWARE: Unexpected error in auth middleware: %s", e, exc_info=True)
+        logger.error("   ├─ Error type: %s", type(e).__name__)
+        logger.error("   ├─ Request path: %s", request.url.path)
+        logger.error("   └─ Request method: %s", request.method)
         return create_error_response(
             "Authentication service temporarily unavailable",
             status_code=503,
@@ -1,6 +1,5 @@
-from jose import JWTError
+from jwt import InvalidTokenError
 from fastapi import Request, HTTPException
-import time
 from app.utils.jwt import decodeJWT, refresh_access_token, TokenExpiredError
 from app.services.user_service import create_user_if_not_exists
 import logging
@@ -63,7 +62,7 @@ async def auth_middleware(request: Request):
             logger.error(f"Token refresh failed: {str(refresh_error)}")
             raise HTTPException(status_code=401, detail="Token refresh failed")
     
-    except JWTError as e:
+    except InvalidTokenError as e:
         logger.warning(f"JWT validation failed: {str(e)}")
         raise HTTPException(status_code=401, detail=f"Invalid token: {str(e)}")
     
@@ -11,6 +11,12 @@ from app.exceptions.global_exceptions import DatabaseConnectionError
 
 logger = logging.getLogger(__name__)
 
+# Fields read by bookmarkModel; fetching only these keeps listing payloads small
+BOOKMARK_PROJECTION = {
+    "doc_id": 1, "user_id": 1, "title": 1, "type": 1, "note": 1,
+    "source_url": 1, "site_name": 1, "date": 1, "space": 1
+}
+
 async def save_memory_to_db(memory_data: dict):
     """
     Save memory data to database with enhanced error handling
@@ -59,7 +65,7 @@ async def get_all_bookmarks_from_db(user_id):
         if not user_id:
             raise MemoryValidationError("User ID is required")
 
-        results = await safe_collection_memories.find({"user_id": user_id})
+        results = await safe_collection_memories.find({"user_id": user_id}, projection=BOOKMARK_PROJECTION)
         return bookmarkModels(results)
 
     except MemoryValidationError:
@@ -94,8 +100,13 @@ async def delete_from_db(doc_id_pincone: str):
         # Check database connection
         logger.info("Checking database connection...")
         try:
-            # Test connection with a simple operation
-            await safe_collection_memories.find_one({"doc_id": doc_id_pincone})
+            # Test connection with a simple operation; the document itself is
+            # not used, so project only doc_id and let the doc_id_1 index
+            # answer without fetching it
+            await safe_collection_memories.find_one(
+                {"doc_id": doc_id_pincone},
+                projection={"_id": 0, "doc_id": 1}
+            )
             logger.info("Database connection successful")
         except Exception as conn_e:
             logger.error(f"Database connection test failed: {str(conn_e)}")
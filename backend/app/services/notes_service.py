@@ -10,6 +10,12 @@ from app.models.notesModel import *
 from app.utils.space_extractor import extract_space_from_text, remove_space_pattern_from_text
 from app.services.pinecone_service import *
 
+# Fields read by note_model; fetching only these keeps listing payloads small
+NOTE_PROJECTION = {
+    "doc_id": 1, "user_id": 1, "type": 1, "title": 1, "note": 1,
+    "date": 1, "space": 1
+}
+
 async def get_all_notes_from_db(user_id: str):
     """
     Get all notes for a user with enhanced error handling.
@@ -18,7 +24,7 @@ async def get_all_notes_from_db(user_id: str):
         if not user_id:
             raise ValidationError("User ID is required")
 
-        notes = await safe_collection_notes.find({"user_id": user_id})
+        notes = await safe_collection_notes.find({"user_id": user_id}, projection=NOTE_PROJECTION)
         return [note_model(note) for note in notes]
 
     except ValidationError:
@@ -1,14 +1,22 @@
 from app.core.database import collection
+from cachetools import TTLCache
 import logging
 
+# Per-field user details are logged at DEBUG; enable them with
+# logging.getLogger("app.services.user_service").setLevel(logging.DEBUG)
 logger = logging.getLogger(__name__)
 
+# User ids recently confirmed to exist in the database. Every authenticated
+# request calls create_user_if_not_exists, so remembering known users for a
+# few minutes turns the per-request upsert into an in-process lookup.
+_known_users = TTLCache(maxsize=10_000, ttl=300)
+
 
 async def create_user_if_not_exists(data: dict):
     """
     Create a user if they do not exist in the database.
     """
-    logger.info(f"👤 USER SERVICE: Checking/creating user from JWT payload")
+    logger.info("👤 USER SERVICE: Checking/creating user from JWT payload")
     
     # Extract data from the decoded JWT
     user_id = data.get("sub")
@@ -18,28 +26,27 @@ async def create_user_if_not_exists(data: dict):
     last_sign_in_at = data.get("updated_at")  # Last sign-in is "updated_at"
     issuer = data.get("iss")  # Top-level claim
 
-    logger.info(f"   ├─ User ID: {user_id}")
-    logger.info(f"   ├─ Email: {email}")
-    logger.info(f"   ├─ Role: {role}")
-    logger.info(f"   ├─ Issuer: {issuer}")
-    logger.info(f"   ├─ Created at: {created_at}")
-    logger.info(f"   └─ Last sign in: {last_sign_in_at}")
-
     # User metadata (e.g., name, picture)
     user_metadata = data.get("user_metadata", {})
     full_name = user_metadata.get("full_name")
     picture = user_metadata.get("picture")
-    
-    logger.info(f"   ├─ Full name: {full_name}")
-    logger.info(f"   └─ Picture present: {bool(picture)}")
 
     # App metadata (e.g., auth provider)
     app_metadata = data.get("app_metadata", {})
     provider = app_metadata.get("provider")
     providers = app_metadata.get("providers")
-    
-    logger.info(f"   ├─ Provider: {provider}")
-    logger.info(f"   └─ Providers: {providers}")
+
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("   ├─ User ID: %s", user_id)
+        logger.debug("   ├─ Email: %s", email)
+        logger.debug("   ├─ Role: %s", role)
+        logger.debug("   ├─ Issuer: %s", issuer)
+        logger.debug("   ├─ Created at: %s", created_at)
+        logger.debug("   ├─ Last sign in: %s", last_sign_in_at)
+        logger.debug("   ├─ Full name: %s", full_name)
+        logger.debug("   ├─ Picture present: %s", bool(picture))
+        logger.debug("   ├─ Provider: %s", provider)
+        logger.debug("   └─ Providers: %s", providers)
 
     # Combine into user_data
     user_data = {
@@ -55,49 +62,39 @@ async def create_user_if_not_exists(data: dict):
         "providers": providers
     }
 
-    logger.info(f"🔍 USER SERVICE: Checking if user exists in database")
-    if not await user_exists(user_id):
-        logger.info(f"➕ USER SERVICE: User not found, creating new user")
-        await create_user(user_data)
-        logger.info(f"✅ USER SERVICE: New user created successfully")
+    if user_id in _known_users:
+        logger.info("✅ USER SERVICE: User recently verified, skipping database check")
+        return user_data
+
+    logger.info("🔍 USER SERVICE: Creating user if not present in database")
+    created = await upsert_user(user_data)
+    _known_users[user_id] = True
+    if created:
+        logger.info("✅ USER SERVICE: New user created successfully")
     else:
-        logger.info(f"✅ USER SERVICE: User already exists, skipping creation")
+        logger.info("✅ USER SERVICE: User already exists, skipping creation")
     
     return user_data
 
 
-async def user_exists(user_id: str):
-    logger.info(f"🔍 USER SERVICE: Checking if user exists")
-    logger.info(f"   └─ User ID: {user_id}")
-    
-    query = collection.find_one({"id": user_id})
-    exists = query is not None
-    
-    logger.info(f"   └─ User exists: {exists}")
-    if exists:
-        logger.info(f"   └─ Found user data keys: {list(query.keys()) if query else 'None'}")
-    
-    return exists
-
-
-async def create_user(user_data: dict):
-    logger.info(f"➕ USER SERVICE: Creating new user in database")
-    logger.info(f"   ├─ User ID: {user_data.get('id')}")
-    logger.info(f"   ├─ Email: {user_data.get('email')}")
-    logger.info(f"   ├─ Full name: {user_data.get('full_name')}")
-    logger.info(f"   └─ Data keys: {list(user_data.keys())}")
-    
+async def upsert_user(user_data: dict) -> bool:
+    """
+    Insert the user only if no document with the same id exists.
+    Single atomic round-trip; returns True when a new user was created.
+    """
     try:
-        result = collection.insert_one(user_data)
-        logger.info(f"✅ USER SERVICE: User created successfully")
-        logger.info(f"   ├─ Inserted ID: {result.inserted_id}")
-        logger.info(f"   └─ Acknowledged: {result.acknowledged}")
-        return user_data
+        result = collection.update_one(
+            {"id": user_data.get("id")},
+            {"$setOnInsert": user_data},
+            upsert=True
+        )
+        created = result.upserted_id is not None
+        if created:
+            logger.info("➕ USER SERVICE: Inserted new user with ID: %s", result.upserted_id)
+        return created
     except Exception as e:
-        logger.error(f"❌ USER SERVICE: Failed to create user in database")
-        logger.error(f"   ├─ Error type: {type(e).__name__}")
-        logger.error(f"   ├─ Error message: {str(e)}")
-        logger.error(f"   └─ This may cause issues with user data persistence")
+        logger.error("❌ USER SERVICE: Failed to upsert user in database")
+        logger.error("   ├─ User ID: %s", user_data.get("id"))
+        logger.error("   ├─ Error type: %s", type(e).__name__)
+        logger.error("   └─ Error message: %s", e)
         raise
-
-    
\ No newline at end of file
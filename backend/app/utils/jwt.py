@@ -1,44 +1,160 @@
-from jose import jwt, JWTError, ExpiredSignatureError
+import jwt
+from jwt import DecodeError, ExpiredSignatureError, InvalidTokenError
 from app.core.config import settings
 from fastapi import HTTPException, status
+from cachetools import TTLCache
+from typing import Optional
+import asyncio
+import hashlib
 import httpx
 import logging
+import orjson
+import re
+import time
 
 logger = logging.getLogger(__name__)
 
+# Payloads of recently verified access tokens, keyed by SHA-256 of the raw
+# token. A browser reuses the same token for every request until it expires,
+# so a hit skips signature verification and claim parsing entirely.
+_verified_tokens = TTLCache(maxsize=10_000, ttl=300)
+# Cached payloads are not served this close to their "exp" claim
+_VERIFIED_EXP_MARGIN_SECONDS = 5
+
+# Audience Supabase puts in user access tokens
+_EXPECTED_AUDIENCE = "authenticated"
+
+# Clock skew tolerated on exp/iat/nbf. PyJWT rejects a token whose "iat" is
+# in the future, which a freshly refreshed token hits whenever Supabase's
+# clock is slightly ahead of ours; python-jose never checked iat.
+_CLOCK_SKEW_LEEWAY_SECONDS = 10
+
+
+# _decode_payload is PyJWT's documented hook for subclasses (requirements.txt
+# pins the compatible range); fail at import rather than silently fall back
+# to the stdlib json parser if a future release renames it
+if not hasattr(jwt.PyJWT, "_decode_payload"):
+    raise ImportError("Installed PyJWT has no _decode_payload hook; see requirements.txt")
+
+
+class _OrjsonPyJWT(jwt.PyJWT):
+    """PyJWT decoder that parses the claims JSON with orjson instead of json"""
+
+    def _decode_payload(self, decoded: dict) -> dict:
+        try:
+            payload = orjson.loads(decoded["payload"])
+        except orjson.JSONDecodeError as e:
+            raise DecodeError(f"Invalid payload string: {e}") from e
+        if not isinstance(payload, dict):
+            raise DecodeError("Invalid payload string: must be a json object")
+        return payload
+
+
+_jwt_decoder = _OrjsonPyJWT()
+
+# Compact JWS shape: three base64url segments separated by dots
+_JWT_RE = re.compile(r'^[A-Za-z0-9_-]+\.[A-Za-z0-9_-]+\.[A-Za-z0-9_-]+$')
+
+# Recent successful refreshes, keyed by SHA-256 of the refresh token. When an
+# access token expires, every in-flight request from that browser tries to
+# refresh with the same refresh token; Supabase rotates refresh tokens, so
+# only the first call would succeed. Concurrent callers wait on a per-token
+# lock and then share the first caller's result.
+_refreshed_tokens = TTLCache(maxsize=1_000, ttl=30)
+_refresh_locks: dict = {}
+# Recent definitive rejections (RefreshRejectedError), shared the same way so
+# a rejected refresh token is sent to Supabase once rather than once per
+# waiting request. Outages, 5xx and 429 responses are not kept, so the next
+# request retries them.
+_failed_refreshes = TTLCache(maxsize=1_000, ttl=5)
+
+# Shared client so token refreshes reuse pooled keep-alive connections to
+# Supabase instead of paying a TCP+TLS handshake per refresh. The app sets it
+# at startup; it is created lazily if refresh is used outside the app.
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """Create the pooled HTTP client used for calls to Supabase Auth"""
+    return httpx.AsyncClient(
+        timeout=10.0,
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+        http2=True
+    )
+
+
+def set_http_client(client: Optional[httpx.AsyncClient]):
+    """Install the shared HTTP client (called on app startup/shutdown)"""
+    global _http_client
+    _http_client = client
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared HTTP client, creating it on first use if needed"""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = create_http_client()
+    return _http_client
+
 
 class TokenExpiredError(Exception):
     """Custom exception for expired tokens that can be refreshed"""
     pass
 
+class RefreshRejectedError(HTTPException):
+    """Supabase rejected the refresh token itself (4xx); retrying cannot succeed"""
+    pass
+
 async def decodeJWT(access_token: str) -> dict:
     """
     Decode Supabase JWT token using the proper JWT secret
     """
-    logger.info(f"🔑 JWT DECODE: Starting JWT token validation")
+    # Runs on every authenticated request; the multi-line log trees below
+    # are only built when INFO is enabled
+    log_info = logger.isEnabledFor(logging.INFO)
+    logger.info("🔑 JWT DECODE: Starting JWT token validation")
     
     # Clean the token input
     original_token_length = len(access_token) if access_token else 0
     access_token = access_token.strip()
-    logger.info(f"   ├─ Original token length: {original_token_length}")
-    logger.info(f"   ├─ Cleaned token length: {len(access_token)}")
+    logger.info("   ├─ Original token length: %d", original_token_length)
+    logger.info("   ├─ Cleaned token length: %d", len(access_token))
     
     # Remove Bearer prefix if present
     if access_token.lower().startswith("bearer "):
         access_token = access_token[7:].strip()
-        logger.info(f"   ├─ Removed Bearer prefix, final length: {len(access_token)}")
+        logger.info("   ├─ Removed Bearer prefix, final length: %d", len(access_token))
 
     if not access_token:
-        logger.error(f"❌ JWT DECODE: Empty access token after cleaning")
+        logger.error("❌ JWT DECODE: Empty access token after cleaning")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Missing access token"
         )
 
+    # Reject inputs that cannot be a JWT before any base64/JSON decoding
+    if not _JWT_RE.match(access_token):
+        logger.warning("❌ JWT DECODE: Malformed token rejected before decoding")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Malformed token"
+        )
+
+    cache_key = hashlib.sha256(access_token.encode()).digest()
+    cached_payload = _verified_tokens.get(cache_key)
+    if cached_payload is not None:
+        if cached_payload["exp"] - time.time() > _VERIFIED_EXP_MARGIN_SECONDS:
+            logger.info("✅ JWT DECODE: Token previously verified, using cached payload")
+            # A copy, so a handler changing request.state.user_payload does
+            # not leak into later requests carrying the same token
+            return dict(cached_payload)
+        _verified_tokens.pop(cache_key, None)
+
     # Use the proper JWT secret for Supabase tokens
-    jwt_secret = settings.SUPABASE_JWT_SECRET.strip()
-    logger.info(f"   ├─ JWT secret configured: {bool(jwt_secret)}")
-    logger.info(f"   ├─ JWT secret length: {len(jwt_secret) if jwt_secret else 0}")
+    jwt_secret = settings.supabase_jwt_secret_stripped
+    if log_info:
+        logger.info("   ├─ JWT secret configured: %s", bool(jwt_secret))
+        logger.info("   ├─ JWT secret length: %s", len(jwt_secret) if jwt_secret else 0)
     
     if not jwt_secret:
         logger.error("❌ JWT DECODE: Supabase JWT secret is missing in configuration")
@@ -47,82 +163,68 @@ async def decodeJWT(access_token: str) -> dict:
             detail="Server configuration error"
         )
 
-    expected_audience = "authenticated"
-    expected_issuer = f"{settings.SUPABASE_URL}/auth/v1"
-    logger.info(f"   ├─ Expected audience: {expected_audience}")
-    logger.info(f"   ├─ Expected issuer: {expected_issuer}")
-    logger.info(f"   └─ Supabase URL: {settings.SUPABASE_URL}")
+    expected_audience = _EXPECTED_AUDIENCE
+    expected_issuer = settings.supabase_issuer
+    if log_info:
+        logger.info("   ├─ Expected audience: %s", expected_audience)
+        logger.info("   ├─ Expected issuer: %s", expected_issuer)
+        logger.info("   └─ Supabase URL: %s", settings.SUPABASE_URL)
 
     try:
-        logger.info(f"🔍 JWT DECODE: Attempting to decode token with HS256 algorithm")
+        logger.info("🔍 JWT DECODE: Attempting to decode token with HS256 algorithm")
         # Decode with Supabase-specific settings
-        payload = jwt.decode(
-            token=access_token,
-            key=jwt_secret,
+        # PyJWT verifies signature, exp, aud and iss by default; "require"
+        # rejects tokens without a subject (user ID) or expiration claim
+        payload = _jwt_decoder.decode(
+            access_token,
+            jwt_secret,
             algorithms=["HS256"],
-            options={
-                "verify_signature": True,
-                "verify_aud": True,  # Supabase tokens have audience
-                "verify_exp": True,
-                "verify_iss": True,  # Supabase tokens have issuer
-            },
+            options={"require": ["exp", "sub"]},
+            leeway=_CLOCK_SKEW_LEEWAY_SECONDS,
             # Expected audience and issuer for Supabase
             audience=expected_audience,
             issuer=expected_issuer
         )
 
-        logger.info(f"✅ JWT DECODE: Token decoded successfully")
-        logger.info(f"   ├─ Payload keys: {list(payload.keys())}")
-        logger.info(f"   ├─ Subject (user_id): {payload.get('sub', 'Missing')}")
-        logger.info(f"   ├─ Email: {payload.get('email', 'Missing')}")
-        logger.info(f"   ├─ Audience: {payload.get('aud', 'Missing')}")
-        logger.info(f"   ├─ Issuer: {payload.get('iss', 'Missing')}")
-        logger.info(f"   ├─ Issued at: {payload.get('iat', 'Missing')}")
-        logger.info(f"   └─ Expires at: {payload.get('exp', 'Missing')}")
-
-        # Validate required claims
-        if 'sub' not in payload:
-            logger.warning("❌ JWT DECODE: Token missing subject (user ID)")
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token: missing user ID"
-            )
-
-        if 'exp' not in payload:
-            logger.warning("❌ JWT DECODE: Token missing expiration claim")
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Token has no expiration"
-            )
+        logger.info("✅ JWT DECODE: Token decoded successfully")
+        if log_info:
+            logger.info("   ├─ Payload keys: %s", list(payload.keys()))
+            logger.info("   ├─ Subject (user_id): %s", payload.get('sub', 'Missing'))
+            logger.info("   ├─ Email: %s", payload.get('email', 'Missing'))
+            logger.info("   ├─ Audience: %s", payload.get('aud', 'Missing'))
+            logger.info("   ├─ Issuer: %s", payload.get('iss', 'Missing'))
+            logger.info("   ├─ Issued at: %s", payload.get('iat', 'Missing'))
+            logger.info("   └─ Expires at: %s", payload.get('exp', 'Missing'))
 
-        logger.info(f"✅ JWT DECODE: All required claims validated successfully")
+        logger.info("✅ JWT DECODE: All required claims validated successfully")
+        _verified_tokens[cache_key] = dict(payload)
         return payload
 
     except ExpiredSignatureError as e:
-        logger.warning(f"⏰ JWT DECODE: Token has expired: {str(e)}")
-        logger.warning(f"   └─ Raising TokenExpiredError for refresh handling")
+        logger.warning("⏰ JWT DECODE: Token has expired: %s", e)
+        logger.warning("   └─ Raising TokenExpiredError for refresh handling")
         raise TokenExpiredError("Token has expired")
-    except JWTError as e:
-        logger.warning(f"❌ JWT DECODE: JWT decoding failed: {str(e)}")
-        logger.warning(f"   ├─ Error type: {type(e).__name__}")
-        logger.warning(f"   └─ This indicates token format or signature issues")
-        # Enhanced error diagnostics
-        debug_info = {
-            "token_length": len(access_token),
-            "secret_configured": bool(jwt_secret),
-            "algorithm": "HS256",
-            "expected_audience": expected_audience,
-            "expected_issuer": expected_issuer
-        }
-        logger.debug(f"🔍 JWT DECODE: Debug info: {debug_info}")
+    except InvalidTokenError as e:
+        logger.warning("❌ JWT DECODE: JWT decoding failed: %s", e)
+        logger.warning("   ├─ Error type: %s", type(e).__name__)
+        logger.warning("   └─ This indicates token format or signature issues")
+        # Enhanced error diagnostics, only built when DEBUG is on
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("🔍 JWT DECODE: Debug info: %s", {
+                "token_length": len(access_token),
+                "secret_configured": bool(jwt_secret),
+                "algorithm": "HS256",
+                "expected_audience": expected_audience,
+                "expected_issuer": expected_issuer
+            })
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=f"Invalid token: {str(e)}"
         )
     except Exception as e:
-        logger.error(f"💥 JWT DECODE: Unexpected error during JWT decoding: {str(e)}")
-        logger.error(f"   ├─ Error type: {type(e).__name__}")
-        logger.error(f"   └─ This is likely a configuration or system error")
+        logger.error("💥 JWT DECODE: Unexpected error during JWT decoding: %s", e)
+        logger.error("   ├─ Error type: %s", type(e).__name__)
+        logger.error("   └─ This is likely a configuration or system error")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Token validation error"
@@ -135,7 +237,7 @@ async def refresh_access_token(refresh_token: str) -> dict:
     Refresh access token using Supabase refresh token
     Returns new access token and refresh token
     """
-    logger.info(f"🔄 TOKEN REFRESH: Starting token refresh process")
+    logger.info("🔄 TOKEN REFRESH: Starting token refresh process")
     
     if not refresh_token or not refresh_token.strip():
         logger.error("❌ TOKEN REFRESH: Empty refresh token provided")
@@ -145,115 +247,175 @@ async def refresh_access_token(refresh_token: str) -> dict:
         )
     
     refresh_token = refresh_token.strip()
-    logger.info(f"   ├─ Refresh token length: {len(refresh_token)}")
-    logger.info(f"   ├─ Refresh token prefix: {refresh_token[:8]}...")
-    
+    logger.info("   ├─ Refresh token length: %s", len(refresh_token))
+    logger.info("   ├─ Refresh token prefix: %.8s...", refresh_token)
+
+    cache_key = hashlib.sha256(refresh_token.encode()).digest()
+    token_data = _recent_refresh_result(cache_key)
+    if token_data is not None:
+        logger.info("✅ TOKEN REFRESH: Reusing result of a refresh that just completed")
+        return token_data
+
+    lock = _refresh_locks.setdefault(cache_key, asyncio.Lock())
+    try:
+        async with lock:
+            # Another request may have refreshed while we waited for the lock
+            token_data = _recent_refresh_result(cache_key)
+            if token_data is not None:
+                logger.info("✅ TOKEN REFRESH: Reusing result of a concurrent refresh")
+                return token_data
+
+            try:
+                token_data = await _request_token_refresh(refresh_token)
+            except RefreshRejectedError as e:
+                _failed_refreshes[cache_key] = e
+                raise
+            _refreshed_tokens[cache_key] = token_data
+            return token_data
+    finally:
+        # Requests still queued on this lock find the result cached above, so
+        # dropping it here cannot start a second refresh of the same token
+        if _refresh_locks.get(cache_key) is lock:
+            del _refresh_locks[cache_key]
+
+
+def _recent_refresh_result(cache_key: bytes) -> Optional[dict]:
+    """
+    Token data of a refresh that just succeeded, or re-raise the error of one
+    that just failed; None when the refresh token has not been tried recently
+    """
+    token_data = _refreshed_tokens.get(cache_key)
+    if token_data is not None:
+        return token_data
+    error = _failed_refreshes.get(cache_key)
+    if error is not None:
+        logger.info("❌ TOKEN REFRESH: Reusing failure of a refresh that just completed")
+        raise RefreshRejectedError(status_code=error.status_code, detail=error.detail)
+    return None
+
+
+async def _request_token_refresh(refresh_token: str) -> dict:
+    """
+    Exchange the refresh token with Supabase Auth (one network round-trip)
+    """
+    log_info = logger.isEnabledFor(logging.INFO)
     # Use the correct Supabase refresh token endpoint format
     url = f"{settings.SUPABASE_URL}/auth/v1/token?grant_type=refresh_token"
-    logger.info(f"   ├─ Refresh endpoint: {url}")
-    logger.info(f"   ├─ Supabase URL: {settings.SUPABASE_URL}")
-    logger.info(f"   └─ Grant type: refresh_token")
+    logger.info("   ├─ Refresh endpoint: %s", url)
+    logger.info("   ├─ Supabase URL: %s", settings.SUPABASE_URL)
+    logger.info("   └─ Grant type: refresh_token")
     
     headers = {
         "apikey": settings.SUPABASE_ANON_KEY,
         "Content-Type": "application/json"
     }
-    logger.info(f"🌐 TOKEN REFRESH: Preparing request headers")
-    logger.info(f"   ├─ API key configured: {bool(settings.SUPABASE_ANON_KEY)}")
-    logger.info(f"   ├─ API key length: {len(settings.SUPABASE_ANON_KEY) if settings.SUPABASE_ANON_KEY else 0}")
-    logger.info(f"   └─ Content-Type: application/json")
+    logger.info("🌐 TOKEN REFRESH: Preparing request headers")
+    if log_info:
+        logger.info("   ├─ API key configured: %s", bool(settings.SUPABASE_ANON_KEY))
+        logger.info("   ├─ API key length: %s", len(settings.SUPABASE_ANON_KEY) if settings.SUPABASE_ANON_KEY else 0)
+        logger.info("   └─ Content-Type: application/json")
     
-    data = {
-        "refresh_token": refresh_token
-    }
+    # Serialised once with orjson and sent as raw bytes, so httpx does not
+    # run json.dumps on the request
+    body = orjson.dumps({"refresh_token": refresh_token})
 
-    async with httpx.AsyncClient(timeout=10.0) as client:
-        try:
-            logger.info(f"📡 TOKEN REFRESH: Sending refresh request to Supabase")
-            logger.info(f"   ├─ Timeout: 10.0 seconds")
-            logger.info(f"   └─ Request payload keys: {list(data.keys())}")
-            
-            response = await client.post(url, headers=headers, json=data)
+    client = get_http_client()
+    try:
+        logger.info("📡 TOKEN REFRESH: Sending refresh request to Supabase")
+        logger.info("   ├─ Timeout: 10.0 seconds")
+        logger.info("   └─ Request payload size: %d bytes", len(body))
+        
+        started_ns = time.perf_counter_ns()
+        response = await client.post(url, headers=headers, content=body)
+        elapsed_ms = (time.perf_counter_ns() - started_ns) // 1_000_000
+        
+        # Log response details for debugging
+        logger.info("📨 TOKEN REFRESH: Response received from Supabase")
+        logger.info("   ├─ Response status: %s", response.status_code)
+        logger.info("   ├─ Round-trip time: %d ms", elapsed_ms)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("   ├─ Response headers: %s", [k for k, _ in response.headers.raw])
+        logger.info("   └─ Response size: %d bytes", len(response.content))
+        
+        if response.status_code == 200:
+            logger.info("✅ TOKEN REFRESH: Successful response from Supabase")
+            token_data = response.json()
             
-            # Log response details for debugging
-            logger.info(f"📨 TOKEN REFRESH: Response received from Supabase")
-            logger.info(f"   ├─ Response status: {response.status_code}")
-            logger.info(f"   ├─ Response headers: {list(response.headers.keys())}")
-            logger.info(f"   └─ Response size: {len(response.content)} bytes")
+            logger.info("🔍 TOKEN REFRESH: Validating response structure")
+            logger.info("   ├─ Response keys: %s", list(token_data.keys()))
             
-            if response.status_code == 200:
-                logger.info(f"✅ TOKEN REFRESH: Successful response from Supabase")
-                token_data = response.json()
-                
-                logger.info(f"🔍 TOKEN REFRESH: Validating response structure")
-                logger.info(f"   ├─ Response keys: {list(token_data.keys())}")
-                
-                # Validate response structure
-                if "access_token" not in token_data:
-                    logger.error(f"❌ TOKEN REFRESH: Invalid refresh response structure")
-                    logger.error(f"   ├─ Expected 'access_token' key missing")
-                    logger.error(f"   └─ Available keys: {list(token_data.keys())}")
-                    raise HTTPException(
-                        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                        detail="Invalid refresh token response from auth service"
-                    )
-                
-                # Log token information (without exposing full tokens)
-                new_access_token = token_data.get("access_token", "")
-                new_refresh_token = token_data.get("refresh_token", "")
-                expires_in = token_data.get("expires_in", "Unknown")
-                token_type = token_data.get("token_type", "Bearer")
-                
-                logger.info(f"🎯 TOKEN REFRESH: New tokens received")
-                logger.info(f"   ├─ New access token length: {len(new_access_token)}")
-                logger.info(f"   ├─ New refresh token length: {len(new_refresh_token)}")
-                logger.info(f"   ├─ Token type: {token_type}")
-                logger.info(f"   ├─ Expires in: {expires_in} seconds")
-                logger.info(f"   └─ Refresh token changed: {new_refresh_token != refresh_token}")
-                
-                logger.info("✅ TOKEN REFRESH: Token refresh completed successfully")
-                return token_data
-            else:
-                # Handle error responses
-                error_text = response.text
-                logger.error(f"❌ TOKEN REFRESH: Supabase refresh failed")
-                logger.error(f"   ├─ Status code: {response.status_code}")
-                logger.error(f"   ├─ Error response: {error_text[:200]}...")
-                logger.error(f"   └─ Full response size: {len(error_text)} characters")
-                
-                try:
-                    error_json = response.json()
-                    error_code = error_json.get("error", "unknown_error")
-                    detail = error_json.get("error_description", error_json.get("msg", "Invalid refresh token"))
-                    logger.error(f"   ├─ Error code: {error_code}")
-                    logger.error(f"   └─ Error description: {detail}")
-                except Exception as json_error:
-                    logger.error(f"   └─ Could not parse error JSON: {str(json_error)}")
-                    detail = "Invalid refresh token"
-                
+            # Validate response structure
+            if "access_token" not in token_data:
+                logger.error("❌ TOKEN REFRESH: Invalid refresh response structure")
+                logger.error("   ├─ Expected 'access_token' key missing")
+                logger.error("   └─ Available keys: %s", list(token_data.keys()))
                 raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail=detail
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail="Invalid refresh token response from auth service"
                 )
             
-        except httpx.HTTPStatusError as e:
-            logger.error(f"❌ TOKEN REFRESH: HTTP status error during refresh")
-            logger.error(f"   ├─ Error type: {type(e).__name__}")
-            logger.error(f"   ├─ Status code: {e.response.status_code if e.response else 'Unknown'}")
-            logger.error(f"   └─ Error message: {str(e)}")
-            raise HTTPException(
+            # Log token information (without exposing full tokens)
+            new_access_token = token_data.get("access_token", "")
+            new_refresh_token = token_data.get("refresh_token", "")
+            expires_in = token_data.get("expires_in", "Unknown")
+            token_type = token_data.get("token_type", "Bearer")
+            
+            if log_info:
+                logger.info("🎯 TOKEN REFRESH: New tokens received")
+                logger.info("   ├─ New access token length: %s", len(new_access_token))
+                logger.info("   ├─ New refresh token length: %s", len(new_refresh_token))
+                logger.info("   ├─ Token type: %s", token_type)
+                logger.info("   ├─ Expires in: %s seconds", expires_in)
+                logger.info("   └─ Refresh token changed: %s", new_refresh_token != refresh_token)
+            
+            logger.info("✅ TOKEN REFRESH: Token refresh completed successfully")
+            return token_data
+        else:
+            # Handle error responses; parse the body once and log the result
+            logger.error("❌ TOKEN REFRESH: Supabase refresh failed")
+            logger.error("   ├─ Status code: %s", response.status_code)
+            try:
+                error_json = response.json()
+            except ValueError:
+                logger.error("   └─ Non-JSON error response: %.200s", response.text)
+                error_json = {}
+            else:
+                logger.error("   ├─ Error response: %s", error_json)
+
+            detail = "Invalid refresh token"
+            if isinstance(error_json, dict) and error_json:
+                error_code = error_json.get("error", "unknown_error")
+                detail = error_json.get("error_description", error_json.get("msg", detail))
+                logger.error("   ├─ Error code: %s", error_code)
+                logger.error("   └─ Error description: %s", detail)
+            
+            # A 4xx (invalid_grant, already used, ...) is final for this
+            # token; 429 and 5xx are Supabase-side and worth retrying
+            definitive = 400 <= response.status_code < 500 and response.status_code != 429
+            error_class = RefreshRejectedError if definitive else HTTPException
+            raise error_class(
                 status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Token refresh failed"
-            )
-        except httpx.RequestError as e:
-            logger.error(f"💥 TOKEN REFRESH: Request error - auth service unavailable")
-            logger.error(f"   ├─ Error type: {type(e).__name__}")
-            logger.error(f"   ├─ Error message: {str(e)}")
-            logger.error(f"   └─ This indicates network or service issues")
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail="Authentication service is unavailable"
+                detail=detail
             )
+        
+    except httpx.HTTPStatusError as e:
+        logger.error("❌ TOKEN REFRESH: HTTP status error during refresh")
+        logger.error("   ├─ Error type: %s", type(e).__name__)
+        logger.error("   ├─ Status code: %s", e.response.status_code if e.response else 'Unknown')
+        logger.error("   └─ Error message: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token refresh failed"
+        )
+    except httpx.RequestError as e:
+        logger.error("💥 TOKEN REFRESH: Request error - auth service unavailable")
+        logger.error("   ├─ Error type: %s", type(e).__name__)
+        logger.error("   ├─ Error message: %s", e)
+        logger.error("   └─ This indicates network or service issues")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication service is unavailable"
+        )
 
 
 # Legacy function for backward compatibility
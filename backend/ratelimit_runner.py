@@ -0,0 +1,320 @@
+"""
+Shared harness for the SlowAPI rate-limit test scripts.
+
+Each script describes what to hit as a list of sections:
+
+    ENDPOINTS = [
+        ("BOOKMARK OPERATIONS", [
+            # (path, method, data, limit, description, quick)
+            ("/links/save", "POST", {...}, 10, "10 requests per minute", False),
+        ]),
+    ]
+
+and calls run(ENDPOINTS, title=..., config=..., summary=...), where config
+and summary are pre-joined banner strings written to stdout in one go.
+"""
+import argparse
+import asyncio
+import httpx
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from dotenv import load_dotenv
+
+# Test configuration
+BASE_URL = "http://localhost:8000"
+
+# Delay between requests in --serial mode (the old paced behaviour)
+SERIAL_DELAY_SECONDS = 0.3
+
+# Wait used between tests when a 429 carries no X-RateLimit-Reset header
+DEFAULT_COOLDOWN_SECONDS = 30
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+RATE_LIMIT_HEADERS = ("X-RateLimit-Limit", "X-RateLimit-Remaining", "X-RateLimit-Reset")
+
+def parse_args(argv=None):
+    """Command line flags shared by the test scripts"""
+    parser = argparse.ArgumentParser(description="SlowAPI rate limiting test")
+    parser.add_argument("--serial", action="store_true",
+                        help="send requests one at a time with a short delay (old behaviour)")
+    parser.add_argument("--no-cooldown", action="store_true",
+                        help="do not wait for the rate limit window to reset between tests")
+    parser.add_argument("--only", metavar="PATH",
+                        help="only test endpoints whose path contains PATH")
+    return parser.parse_args(argv)
+
+def load_cookies():
+    """Authentication cookies from TEST_ACCESS_TOKEN / TEST_REFRESH_TOKEN (env or .env)"""
+    load_dotenv()
+    return {
+        "access_token": os.environ["TEST_ACCESS_TOKEN"],
+        "refresh_token": os.environ["TEST_REFRESH_TOKEN"]
+    }
+
+def create_client(cookies, base_url=BASE_URL):
+    """Pooled async client shared by every request in the run"""
+    return httpx.AsyncClient(
+        base_url=base_url,
+        cookies=cookies,
+        limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+        timeout=10.0
+    )
+
+def print_headers(response, out):
+    """Add rate limit headers to the endpoint's output if they exist"""
+    h = response.headers
+    headers_found = {k: h[k] for k in RATE_LIMIT_HEADERS if k in h}
+    if headers_found:
+        out.append(f"      Rate Limit Headers: {headers_found}")
+
+def reset_epoch_from(response):
+    """Epoch time at which the rate limit window in a 429 response resets"""
+    try:
+        reset = float(response.headers["X-RateLimit-Reset"])
+    except (KeyError, ValueError):
+        return None
+    # SlowAPI sends an epoch timestamp; small values are seconds remaining
+    return reset if reset > 1e9 else time.time() + reset
+
+async def wait_for_reset(rate_limited, reset_epoch):
+    """Sleep until the window the last test exhausted has reset"""
+    if not rate_limited:
+        return
+    if reset_epoch is None:
+        wait = DEFAULT_COOLDOWN_SECONDS
+    else:
+        wait = max(0, reset_epoch - time.time())
+    print(f"\n⏰ Waiting {wait:.0f} seconds before next test...")
+    await asyncio.sleep(wait)
+
+def is_rate_limited(response):
+    """True for a 429 response (False for transport errors)"""
+    return not isinstance(response, Exception) and response.status_code == 429
+
+async def send_request(client, endpoint, method, body, i):
+    """Send one request to the endpoint under test (body is pre-encoded JSON)"""
+    if method == "GET":
+        return await client.get(endpoint)
+    elif method == "DELETE":
+        # For delete endpoints, we need to handle parameters differently
+        if "delete" in endpoint:
+            return await client.delete(endpoint, params={"doc_id_pincone": f"test_id_{i}"})
+        return await client.delete(endpoint)
+    else:  # POST or PUT
+        if body is None:
+            return await client.post(endpoint)
+        return await client.post(endpoint, content=body, headers=JSON_HEADERS)
+
+async def test_endpoint_rate_limit(client, endpoint, method, data, limit_count, limit_description, quick_test=False, serial=False):
+    """Test a specific endpoint to trigger rate limiting"""
+    # The endpoint's report is collected here and printed in one go when it
+    # finishes, instead of a print (and flush) per line
+    out = []
+    try:
+        return await _test_endpoint_rate_limit(client, endpoint, method, data, limit_count, limit_description, quick_test, serial, out)
+    finally:
+        print("\n".join(out), flush=True)
+
+async def _test_endpoint_rate_limit(client, endpoint, method, data, limit_count, limit_description, quick_test, serial, out):
+    out.append(f"\n=== Testing {method} {endpoint} ({limit_description}) ===")
+
+    successful_requests = 0
+    rate_limited = False
+    reset_epoch = None
+    first_429_at = None
+
+    # For quick tests, just do a few requests above the limit
+    if quick_test:
+        test_requests = min(limit_count + 2, 8)  # Cap at 8 requests for quick tests
+    else:
+        test_requests = limit_count + 3
+
+    # Every request to the endpoint carries the same payload; encode it once
+    body = json.dumps(data).encode() if data is not None else None
+
+    if serial:
+        # Old paced behaviour, kept for head-to-head comparison
+        burst_size = 0
+    else:
+        # Everything up to the advertised limit goes out at once
+        burst_size = min(limit_count, test_requests)
+
+    responses = []
+    if burst_size:
+        # Results come back in request order
+        responses = await asyncio.gather(
+            *(send_request(client, endpoint, method, body, i) for i in range(burst_size)),
+            return_exceptions=True
+        )
+
+    # Probe past the limit one request at a time; once two 429s in a row
+    # confirm the limit is sticky, further requests would only 429 again
+    for i in range(burst_size, test_requests):
+        if len(responses) >= 2 and all(is_rate_limited(r) for r in responses[-2:]):
+            break
+        try:
+            responses.append(await send_request(client, endpoint, method, body, i))
+        except Exception as e:
+            responses.append(e)
+        if serial:
+            # Small delay between requests
+            await asyncio.sleep(SERIAL_DELAY_SECONDS)
+
+    for i, response in enumerate(responses):
+        if isinstance(response, Exception):
+            out.append(f"Request {i + 1:2d}: ❌ Error - {response}")
+            continue
+
+        status = response.status_code
+        out.append(f"Request {i + 1:2d}: Status {status}")
+        print_headers(response, out)
+
+        if status == 200:
+            successful_requests += 1
+            out.append("      ✅ Success")
+        elif status == 429:
+            if not rate_limited:
+                first_429_at = i
+                rate_limited = True
+            reset_epoch = reset_epoch_from(response)
+            # Decode the body once: as JSON when the server says it is JSON
+            if "application/json" in response.headers.get("content-type", ""):
+                try:
+                    out.append(f"      🚫 Rate Limited! {response.json()}")
+                except ValueError:
+                    out.append(f"      🚫 Rate Limited! {response.text[:200]}")
+            else:
+                out.append(f"      🚫 Rate Limited! {response.text[:200]}")
+        elif status == 422:
+            # Validation error - still counts as a request that went through rate limiting
+            successful_requests += 1
+            out.append("      ⚠️  Validation Error (but rate limit applied)")
+        else:
+            out.append(f"      ⚠️  Other response: {status} - {response.text[:100]}")
+
+    out.append(f"\nResults for {endpoint}:")
+    out.append(f"  - Successful requests: {successful_requests}")
+    out.append(f"  - Rate limiting triggered: {'✅ YES' if rate_limited else '❌ NO'}")
+    if first_429_at is not None:
+        out.append(f"  - First 429 at request {first_429_at + 1} (advertised limit: {limit_count})")
+
+    return successful_requests, rate_limited, reset_epoch
+
+async def test_section(client, title, endpoints, args):
+    """Test every endpoint of one section, waiting for the limit to reset in between"""
+    if args.only:
+        endpoints = [e for e in endpoints if args.only in e[0]]
+        if not endpoints:
+            return
+
+    print("\n" + "="*70)
+    print(f"TESTING {title}")
+    print("="*70)
+
+    for n, (endpoint, method, data, limit_count, limit_description, quick_test) in enumerate(endpoints):
+        success, limited, reset_epoch = await test_endpoint_rate_limit(
+            client, endpoint, method, data, limit_count, limit_description, quick_test, args.serial
+        )
+        if n < len(endpoints) - 1 and not args.no_cooldown:
+            await wait_for_reset(limited, reset_epoch)
+
+async def test_auth_status(client, response=None):
+    """Test authentication status first (response: an already-sent /auth/status probe)"""
+    print("=== Testing Authentication Status ===")
+
+    try:
+        if response is None:
+            response = await client.get("/auth/status")
+        elif isinstance(response, Exception):
+            raise response
+        print(f"Auth Status: {response.status_code}")
+
+        if response.status_code == 200:
+            auth_data = response.json()
+            print(f"✅ Authenticated as: {auth_data.get('user_email', 'Unknown')}")
+            print(f"   User ID: {auth_data.get('user_id', 'Unknown')}")
+            print(f"   Token Valid: {auth_data.get('token_valid', False)}")
+            return True
+        else:
+            print(f"❌ Authentication failed: {response.text}")
+            return False
+
+    except Exception as e:
+        print(f"❌ Auth check failed: {str(e)}")
+        return False
+
+async def run_suite(client, sections, title, config, summary, base_url, args):
+    """Main test function"""
+    sys.stdout.write(
+        f"🚀 {title}\n"
+        f"{'=' * 80}\n"
+        f"Test started at: {datetime.now()}\n"
+        f"Target server: {base_url}\n"
+    )
+
+    # The health and auth probes are independent; send both at once on the
+    # shared client and report them in order
+    health_response, auth_response = await asyncio.gather(
+        client.get("/health"), client.get("/auth/status"), return_exceptions=True
+    )
+
+    # Check if server is running
+    try:
+        if isinstance(health_response, Exception):
+            raise health_response
+        if health_response.status_code != 200:
+            print("❌ Server is not responding to health check")
+            return
+        print("✅ Server is running")
+    except Exception as e:
+        print(f"❌ Cannot connect to server: {str(e)}")
+        return
+
+    # Test authentication
+    if not await test_auth_status(client, auth_response):
+        print("❌ Authentication failed. Cannot proceed with rate limit testing.")
+        return
+
+    if config:
+        sys.stdout.write(config + "\n")
+
+    # Run tests
+    try:
+        for section_title, endpoints in sections:
+            await test_section(client, section_title, endpoints, args)
+
+        sys.stdout.write(
+            f"\n{'=' * 80}\n"
+            "🎉 RATE LIMITING TESTS COMPLETED\n"
+            f"{'=' * 80}\n"
+            f"Test completed at: {datetime.now()}\n"
+            "\n📊 TEST SUMMARY:\n"
+            f"{summary}\n"
+        )
+
+    except KeyboardInterrupt:
+        print("\n⏹️  Tests interrupted by user")
+    except Exception as e:
+        print(f"\n❌ Test failed with error: {str(e)}")
+
+async def run_async(sections, title, config="", summary="", cookies=None, base_url=BASE_URL, args=None):
+    """Run the suite on one pooled client"""
+    if args is None:
+        args = parse_args([])
+    if cookies is None:
+        try:
+            cookies = load_cookies()
+        except KeyError as e:
+            print(f"❌ Missing environment variable {e}; set TEST_ACCESS_TOKEN and TEST_REFRESH_TOKEN")
+            return
+    async with create_client(cookies, base_url) as client:
+        await run_suite(client, sections, title, config, summary, base_url, args)
+
+def run(sections, title, config="", summary="", cookies=None, base_url=BASE_URL):
+    """Entry point for the test scripts"""
+    args = parse_args()
+    asyncio.run(run_async(sections, title, config, summary, cookies, base_url, args))